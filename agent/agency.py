@@ -1,5 +1,7 @@
+import sys
+from copy import deepcopy
 from dataclasses import dataclass
-from typing import Any, List
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 from rich.console import Console
 
@@ -7,18 +9,135 @@ from llms.llm import LLM
 from tools.index import Tool
 from utils.pubsub import PubSub
 
-console = Console()
+console = Console(highlight=False, log_time=False)
+# Decided once at import; when output isn't a terminal, errors skip Rich entirely
+is_tty = sys.stdout.isatty()
 
 
-@dataclass
+def print_error(message: str):
+    if is_tty:
+        console.print(message, style="bold red", markup=False)
+    else:
+        sys.stderr.write(f"{message}\n")
+
+
+def freeze_requirements(requirements: List[str]) -> Tuple[str, ...]:
+    # Requirements are only ever replaced wholesale, so store them immutably and
+    # intern the strings, since generated tasks often repeat the same requirement
+    return tuple(sys.intern(r) if isinstance(r, str) else r for r in requirements)
+
+
+@dataclass(slots=True)
 class Task:
     id: str
     description: str
-    requirements: List[str]
+    requirements: Tuple[str, ...]
     completed: bool
     notes: str
 
 
+@dataclass
+class TaskToolSpec:
+    # name is both the tool name and the Agency method that implements it
+    name: str
+    description: str
+    parameters: Dict[str, Any]
+    success: str
+    error: str
+    # Required string arguments that must also not be empty
+    non_empty: Tuple[str, ...] = ()
+    # Extra values for the success message, read before the tool runs
+    success_context: Optional[Callable[["Agency"], Dict[str, Any]]] = None
+
+
+TASK_TOOL_SPECS: List[TaskToolSpec] = [
+    TaskToolSpec(
+        name="create_task",
+        description="Use this tool to create a new task.",
+        parameters={
+            "type": "object",
+            "properties": {
+                "description": {
+                    "type": "string",
+                    "description": "A description of the overall task.",
+                },
+                "requirements": {
+                    "type": "array",
+                    "description": "A list of requirements for the task.",
+                    "items": {"type": "string"},
+                },
+                "completed": {
+                    "type": "boolean",
+                    "description": "Whether the task is currently completed. Defaults to False.",
+                },
+            },
+            "required": ["description", "requirements"],
+        },
+        success="Task created with id {new_task_id}.",
+        error="Error creating task.",
+        non_empty=("description",),
+        success_context=lambda agency: {"new_task_id": agency.get_new_task_id()},
+    ),
+    TaskToolSpec(
+        name="complete_task",
+        description="Use this to mark a task complete.",
+        parameters={
+            "type": "object",
+            "properties": {
+                "task_id": {
+                    "type": "string",
+                    "description": "The id of the task to complete.",
+                },
+            },
+            "required": ["task_id"],
+        },
+        success="Task with id {task_id} marked as complete.",
+        error="Error completing task with id {task_id}.",
+    ),
+    TaskToolSpec(
+        name="modify_task_notes",
+        description="Use this to modify the notes for a task.",
+        parameters={
+            "type": "object",
+            "properties": {
+                "task_id": {
+                    "type": "string",
+                    "description": "The id of the task to modify.",
+                },
+                "notes": {
+                    "type": "string",
+                    "description": "The new notes for the task.",
+                },
+            },
+            "required": ["task_id", "notes"],
+        },
+        success="Notes for task with id {task_id} modified.",
+        error="Error modifying notes for task with id {task_id}.",
+    ),
+    TaskToolSpec(
+        name="modify_task_requirements",
+        description="Use this to modify the requirements for a task.",
+        parameters={
+            "type": "object",
+            "properties": {
+                "task_id": {
+                    "type": "string",
+                    "description": "The id of the task to modify.",
+                },
+                "requirements": {
+                    "type": "array",
+                    "description": "The new requirements for the task.",
+                    "items": {"type": "string"},
+                },
+            },
+            "required": ["task_id", "requirements"],
+        },
+        success="Requirements for task with id {task_id} modified.",
+        error="Error modifying requirements for task with id {task_id}.",
+    ),
+]
+
+
 class Agency:
     pubsub: PubSub
     llm: LLM
@@ -30,9 +149,27 @@ class Agency:
         self.llm = llm
         self.tasks = []
         self.silence_actions = silence_actions
+        # Index of tasks by id, so lookups don't scan the whole task list
+        self._by_id: Dict[str, Task] = {}
+        # Monotonic counter so ids stay unique even if tasks are ever removed
+        self._next_id: int = 0
+        # Bumped on every task mutation; used to invalidate the description cache
+        self._version: int = 0
+        self._desc_cache: Optional[Tuple[int, str]] = None
+        # Task tools are built once; their run closures still act on this instance
+        self._tools: Dict[str, Tool] = {
+            spec.name: self._make_tool(spec) for spec in TASK_TOOL_SPECS
+        }
+
+    def _mark_dirty(self) -> None:
+        self._version += 1
+        self._desc_cache = None
 
     def get_new_task_id(self) -> str:
-        return f"task_{len(self.tasks) + 1}"
+        return f"task_{self._next_id + 1}"
+
+    def get_task(self, task_id: str) -> Optional[Task]:
+        return self._by_id.get(task_id)
 
     def get_incomplete_tasks(self) -> List[Task]:
         return [t for t in self.tasks if not t.completed]
@@ -44,21 +181,24 @@ class Agency:
         return any(not t.completed for t in self.tasks)
 
     def get_tasks_described(self, tasks: List[Task]):
-        description = ""
+        parts: List[str] = []
         for task in tasks:
-            description += "---"
-            description += f"Task ID: {task.id}\n"
-            description += f"Description: {task.description}\n"
-            description += "Requirements: {}\n".format(
-                "\n".join([f"- {req}" for req in task.requirements])
+            req_block = "\n".join(f"- {req}" for req in task.requirements)
+            parts.append(
+                f"---\nTask ID: {task.id}\n"
+                f"Description: {task.description}\n"
+                f"Requirements:\n{req_block}\n"
+                f"Notes:\n{task.notes}\n"
+                f"Completed: {task.completed}\n\n---"
             )
-            description += f"Notes:\n{task.notes}\n"
-            description += f"Completed: {task.completed}\n\n"
-            description += "---"
-        return description
+        return "".join(parts)
 
     def get_incomplete_tasks_described(self):
-        return self.get_tasks_described(self.get_incomplete_tasks())
+        if self._desc_cache and self._desc_cache[0] == self._version:
+            return self._desc_cache[1]
+        description = self.get_tasks_described(self.get_incomplete_tasks())
+        self._desc_cache = (self._version, description)
+        return description
 
     def create_task(
         self, description: str, requirements: List[str], completed=False
@@ -68,11 +208,14 @@ class Agency:
             task = Task(
                 id=id,
                 description=description,
-                requirements=requirements,
+                requirements=freeze_requirements(requirements),
                 completed=completed,
                 notes="",
             )
+            self._next_id += 1
+            self._by_id[id] = task
             self.tasks.append(task)
+            self._mark_dirty()
             if not self.silence_actions:
                 console.print(
                     f"Created task: [italic]{description}[/italic]",
@@ -81,196 +224,107 @@ class Agency:
             self.pubsub.publish("task_created", task)
             return True
         except Exception as e:
-            console.print(f"Error creating task: {e}", style="bold red")
+            print_error(f"Error creating task: {e}")
             return False
 
     def complete_task(self, task_id: str) -> bool:
         try:
-            for task in self.tasks:
-                if task.id == task_id:
-                    task.completed = True
-                    self.pubsub.publish("task_completed", task)
-                    if not self.silence_actions:
-                        console.print(
-                            f"Completed task: [italic]{task.description}[/italic]",
-                            style="green",
-                        )
-                    return True
-            console.print(f"Task {task_id} not found.", style="bold red")
-            return False
+            task = self.get_task(task_id)
+            if task is None:
+                print_error(f"Task {task_id} not found.")
+                return False
+            task.completed = True
+            self._mark_dirty()
+            self.pubsub.publish("task_completed", task)
+            if not self.silence_actions:
+                console.print(
+                    f"Completed task: [italic]{task.description}[/italic]",
+                    style="green",
+                )
+            return True
         except Exception as e:
-            console.print(f"Error completing task: {e}", style="bold red")
+            print_error(f"Error completing task: {e}")
             return False
 
     def modify_task_notes(self, task_id: str, notes: str) -> bool:
         try:
-            for task in self.tasks:
-                if task.id == task_id:
-                    task.notes = notes
-                    self.pubsub.publish("task_notes_modified", task)
-                    if not self.silence_actions:
-                        console.print(
-                            f"Modified notes for task: [italic]{task.description}[/italic]",
-                            style="green",
-                        )
-                    return True
-            console.print(f"Task {task_id} not found.", style="bold red")
-            return False
+            task = self.get_task(task_id)
+            if task is None:
+                print_error(f"Task {task_id} not found.")
+                return False
+            task.notes = notes
+            self._mark_dirty()
+            self.pubsub.publish("task_notes_modified", task)
+            if not self.silence_actions:
+                console.print(
+                    f"Modified notes for task: [italic]{task.description}[/italic]",
+                    style="green",
+                )
+            return True
         except Exception as e:
-            console.print(f"Error modifying notes: {e}", style="bold red")
+            print_error(f"Error modifying notes: {e}")
             return False
 
     def modify_task_requirements(self, task_id: str, requirements: List[str]) -> bool:
         try:
-            for task in self.tasks:
-                if task.id == task_id:
-                    task.requirements = requirements
-                    self.pubsub.publish("task_requirements_modified", task)
-                    if not self.silence_actions:
-                        console.print(
-                            f"Modified requirements for task: [italic]{task.description}[/italic]",
-                            style="green",
-                        )
-                    return True
-            console.print(f"Task {task_id} not found.", style="bold red")
-            return False
+            task = self.get_task(task_id)
+            if task is None:
+                print_error(f"Task {task_id} not found.")
+                return False
+            task.requirements = freeze_requirements(requirements)
+            self._mark_dirty()
+            self.pubsub.publish("task_requirements_modified", task)
+            if not self.silence_actions:
+                console.print(
+                    f"Modified requirements for task: [italic]{task.description}[/italic]",
+                    style="green",
+                )
+            return True
         except Exception as e:
-            console.print(f"Error modifying requirements: {e}", style="bold red")
+            print_error(f"Error modifying requirements: {e}")
             return False
 
     def create_task_tool(self) -> Tool:
-        def run(args: Any, pubsub: PubSub):
-            description = args.get("description")
-            requirements = args.get("requirements")
-            completed = args.get("completed") or False
-            id = self.get_new_task_id()
-
-            if not description:
-                return "Error creating task: No description provided."
-            if not requirements:
-                return "Error creating task: No requirements provided."
-            if not isinstance(requirements, list):
-                return "Error creating task: Requirements must be a list."
-
-            worked = self.create_task(description, requirements, completed)
-            if not worked:
-                return "Error creating task."
-            return f"Task created with id {id}."
-
-        return Tool(
-            name="create_task",
-            description="Use this tool to create a new task.",
-            function=run,
-            parameters={
-                "type": "object",
-                "properties": {
-                    "description": {
-                        "type": "string",
-                        "description": "A description of the overall task.",
-                    },
-                    "requirements": {
-                        "type": "array",
-                        "description": "A list of requirements for the task.",
-                        "items": {"type": "string"},
-                    },
-                    "completed": {
-                        "type": "boolean",
-                        "description": "Whether the task is currently completed. Defaults to False.",
-                    },
-                },
-                "required": ["description", "requirements"],
-            },
-        )
+        return self._tools["create_task"]
 
     def complete_task_tool(self) -> Tool:
-        def run(args: Any, pubsub: PubSub):
-            task_id = args.get("task_id")
-            if task_id is None:
-                return f"Task with id {task_id} not found."
-            worked = self.complete_task(task_id)
-            if not worked:
-                return f"Error completing task with id {task_id}."
-            return f"Task with id {task_id} marked as complete."
-
-        return Tool(
-            name="complete_task",
-            description="Use this to mark a task complete.",
-            function=run,
-            parameters={
-                "type": "object",
-                "properties": {
-                    "task_id": {
-                        "type": "string",
-                        "description": "The id of the task to complete.",
-                    },
-                },
-                "required": ["task_id"],
-            },
-        )
+        return self._tools["complete_task"]
 
     def modify_task_notes_tool(self) -> Tool:
-        def run(args: Any, pubsub: PubSub):
-            task_id = args.get("task_id")
-            notes = args.get("notes")
-            if task_id is None:
-                return f"Task with id {task_id} not found."
-            worked = self.modify_task_notes(task_id, notes)
-            if not worked:
-                return f"Error modifying notes for task with id {task_id}."
-            return f"Notes for task with id {task_id} modified."
-
-        return Tool(
-            name="modify_task_notes",
-            description="Use this to modify the notes for a task.",
-            function=run,
-            parameters={
-                "type": "object",
-                "properties": {
-                    "task_id": {
-                        "type": "string",
-                        "description": "The id of the task to modify.",
-                    },
-                    "notes": {
-                        "type": "string",
-                        "description": "The new notes for the task.",
-                    },
-                },
-                "required": ["task_id", "notes"],
-            },
-        )
+        return self._tools["modify_task_notes"]
 
     def modify_task_requirements_tool(self) -> Tool:
+        return self._tools["modify_task_requirements"]
+
+    def _make_tool(self, spec: TaskToolSpec) -> Tool:
+        impl = getattr(self, spec.name)
+        # Each instance gets its own schema, so the shared spec table can't be mutated
+        parameters = deepcopy(spec.parameters)
+        properties = parameters["properties"]
+        required = parameters["required"]
+        array_args = [k for k, v in properties.items() if v["type"] == "array"]
+
         def run(args: Any, pubsub: PubSub):
-            task_id = args.get("task_id")
-            requirements = args.get("requirements")
-            if task_id is None:
-                return f"Task with id {task_id} not found."
-            if not requirements:
-                return "Error modifying task: No requirements provided."
-            if not isinstance(requirements, list):
-                return "Error modifying task: Requirements must be a list."
-            worked = self.modify_task_requirements(task_id, requirements)
-            if not worked:
-                return f"Error modifying requirements for task with id {task_id}."
-            return f"Requirements for task with id {task_id} modified."
+            args = args or {}
+            for arg in required:
+                value = args.get(arg)
+                if value is None or (
+                    (arg in array_args or arg in spec.non_empty) and not value
+                ):
+                    return f"Error running {spec.name}: No {arg} provided."
+            for arg in array_args:
+                if arg in args and not isinstance(args[arg], list):
+                    return f"Error running {spec.name}: {arg} must be a list."
+
+            kwargs = {k: args[k] for k in properties if args.get(k) is not None}
+            context = spec.success_context(self) if spec.success_context else {}
+            if not impl(**kwargs):
+                return spec.error.format(**kwargs)
+            return spec.success.format(**context, **kwargs)
 
         return Tool(
-            name="modify_task_requirements",
-            description="Use this to modify the requirements for a task.",
+            name=spec.name,
+            description=spec.description,
             function=run,
-            parameters={
-                "type": "object",
-                "properties": {
-                    "task_id": {
-                        "type": "string",
-                        "description": "The id of the task to modify.",
-                    },
-                    "requirements": {
-                        "type": "array",
-                        "description": "The new requirements for the task.",
-                        "items": {"type": "string"},
-                    },
-                },
-                "required": ["task_id", "requirements"],
-            },
+            parameters=parameters,
         )
@@ -1,8 +1,7 @@
-import json
 import threading
-import time
 from typing import List, Optional
 
+import orjson
 from rich.console import Console
 from rich.markdown import Markdown
 
@@ -33,6 +32,7 @@ class Agent:
     running: bool = False
     awake: bool = False
     thread: threading.Thread
+    stop_event: threading.Event
     verbose: bool
     silence_actions: bool
     iteration: int = 0
@@ -45,8 +45,10 @@ class Agent:
         toolbox: Toolbox,
         verbose: bool,
         silence_actions: bool,
+        stop_event: Optional[threading.Event] = None,
     ) -> None:
         self.pubsub = pubsub
+        self.stop_event = stop_event or threading.Event()
         self.llm = llm
         self.toolbox = toolbox
         self.verbose = verbose
@@ -81,6 +83,7 @@ class Agent:
 
     def stop(self):
         self.running = False
+        self.stop_event.set()
 
     def error(self, message: str):
         self.pubsub.publish("agent_error", message)
@@ -89,22 +92,33 @@ class Agent:
         self.pubsub.publish("agent_log", message)
 
     def log_messages(self):
-        json_messages = json.dumps([message.to_json() for message in self.messages])
+        json_messages = orjson.dumps(
+            [message.to_dict() for message in self.messages]
+        ).decode()
         self.pubsub.publish("agent_log", json_messages)
 
     def run(self):
-        if self.running:
+        if self.running and not self.stop_event.is_set():
             self.memory.sync_messages(self.messages)
             if self.check_waking_state():
                 self.log_messages()
                 self.iteration += 1
                 if self.verbose:
                     self.log(f"Iteration {self.iteration}")
-                response_message = self.reason()
+                try:
+                    response_message = self.reason()
+                except Exception:
+                    # The LLM client is closed on shutdown, so a request made while
+                    # stopping may fail; that's expected rather than an agent error
+                    if self.stop_event.is_set():
+                        return
+                    raise
                 self.act(response_message)
                 self.run()
 
-            time.sleep(1)
+            # Wait between checks, but wake immediately when asked to stop
+            if self.stop_event.wait(1):
+                return
             self.run()
 
     def check_waking_state(self):
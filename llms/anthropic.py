@@ -46,6 +46,11 @@ def init_anthropic_llm():
         )
 
 
+def close_anthropic_llm():
+    if anthropic_client:
+        anthropic_client.close()
+
+
 def tool_to_anthropic_tool_call(tool: Tool) -> ToolParam:
     return ToolParam(
         name=tool.name,
@@ -228,4 +233,5 @@ AnthropicLLM = LLM(
     model_name=anthropic_model,
     get_model_response=get_anthropic_model_response,
     on_startup=init_anthropic_llm,
+    on_shutdown=close_anthropic_llm,
 )
@@ -1,11 +1,18 @@
-from dataclasses import asdict, dataclass
-from typing import Callable, List, Optional
+from collections import OrderedDict
+from copy import deepcopy
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional
+import hashlib
+import os
+import threading
 import time
 
+import orjson
+
 from tools.index import Tool, ToolCall
 
 
-@dataclass
+@dataclass(slots=True)
 class Message:
     id: Optional[str]
     content: Optional[str]
@@ -13,16 +20,32 @@ class Message:
     tool_calls: Optional[List[ToolCall]]
     tool_call_id: Optional[str] = None
 
-    def to_json(self):
-        return asdict(self)
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "content": self.content,
+            "role": self.role,
+            "tool_calls": [
+                {"id": tc.id, "name": tc.name, "arguments": tc.arguments}
+                for tc in self.tool_calls
+            ]
+            if self.tool_calls
+            else None,
+            "tool_call_id": self.tool_call_id,
+        }
+
+    def to_json(self) -> bytes:
+        return orjson.dumps(self.to_dict())
 
 
 class LLM:
     get_model_response: Callable[[List[Message], List[Tool], str], Message]
     on_startup: Optional[Callable[[], None]] = None
+    on_shutdown: Optional[Callable[[], None]] = None
     name: str
     model_name: str
     system_prompt: str
+    cache_size: int
 
     def __init__(
         self,
@@ -30,19 +53,81 @@ class LLM:
         model_name,
         get_model_response: Callable[[List[Message], List[Tool], str], Message],
         on_startup: Optional[Callable[[], None]] = None,
+        on_shutdown: Optional[Callable[[], None]] = None,
     ):
         self.name = name
         self.model_name = model_name
         self.get_model_response = get_model_response
         self.on_startup = on_startup
+        self.on_shutdown = on_shutdown
+        # LRU of responses keyed by a hash of the full request. Off by default: the
+        # agent loop sends an ever-growing history, so it would only pay for hashing.
+        self.cache_size = int(os.environ.get("LLM_CACHE_SIZE", 0))
+        self._exact_cache: OrderedDict[bytes, Message] = OrderedDict()
+        self._cache_lock = threading.Lock()
 
     def startup(self, system_prompt: str):
         self.system_prompt = system_prompt
         if self.on_startup:
             self.on_startup()
 
+    def shutdown(self):
+        # Closes the underlying client so no new requests are made while stopping
+        if self.on_shutdown:
+            self.on_shutdown()
+
+    def get_cache_key(
+        self, messages: List[Message], tools: List[Tool], system_prompt: str
+    ) -> bytes:
+        canonical = orjson.dumps(
+            {
+                "model": self.model_name,
+                "system_prompt": system_prompt,
+                "messages": [message.to_dict() for message in messages],
+                "tools": [
+                    {
+                        "name": tool.name,
+                        "description": tool.description,
+                        "parameters": tool.parameters,
+                    }
+                    for tool in tools
+                ],
+            },
+            default=str,
+            option=orjson.OPT_SORT_KEYS,
+        )
+        return hashlib.blake2b(canonical, digest_size=16).digest()
+
+    def get_cached_model_response(
+        self, messages: List[Message], tools: List[Tool], system_prompt: str
+    ) -> Message:
+        if self.cache_size <= 0:
+            return self.get_model_response(messages, tools, system_prompt)
+
+        key = self.get_cache_key(messages, tools, system_prompt)
+        with self._cache_lock:
+            cached = self._exact_cache.get(key)
+            if cached is not None:
+                self._exact_cache.move_to_end(key)
+        if cached is not None:
+            # Deep copies on the way in and out, so callers never share tool calls
+            # or argument dicts with the cached entry
+            return deepcopy(cached)
+
+        response = self.get_model_response(messages, tools, system_prompt)
+        with self._cache_lock:
+            self._exact_cache[key] = deepcopy(response)
+            self._exact_cache.move_to_end(key)
+            while len(self._exact_cache) > self.cache_size:
+                self._exact_cache.popitem(last=False)
+        return response
+
+    def clear_cache(self):
+        with self._cache_lock:
+            self._exact_cache.clear()
+
     def get_response(self, messages: List[Message], tools: List[Tool]) -> Message:
-        return self.get_model_response(messages, tools, self.system_prompt)
+        return self.get_cached_model_response(messages, tools, self.system_prompt)
         # sometimes useful for testing:
         # time.sleep(1)
         # return Message(
@@ -59,7 +144,7 @@ class LLM:
         # )
 
     def get_text_response(self, message: str, system_prompt: str) -> str:
-        response = self.get_model_response(
+        response = self.get_cached_model_response(
             [Message(id=None, content=message, role="user", tool_calls=None)],
             [],
             system_prompt,
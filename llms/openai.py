@@ -1,7 +1,7 @@
-import json
 import os
 from typing import List
 
+import orjson
 from dotenv import load_dotenv
 from openai import NOT_GIVEN, OpenAI
 from openai.types.chat import (
@@ -40,7 +40,7 @@ def tool_to_openai_tool_call(tool: Tool) -> ChatCompletionToolParam:
 
 
 def openai_tool_call_to_tool_call(tool_call: ChatCompletionMessageToolCall) -> ToolCall:
-    parsed_arguments = json.loads(tool_call.function.arguments)
+    parsed_arguments = orjson.loads(tool_call.function.arguments)
     return ToolCall(
         name=tool_call.function.name, arguments=parsed_arguments, id=tool_call.id
     )
@@ -52,7 +52,7 @@ def tool_call_to_openai_tool_call(
     return ChatCompletionMessageToolCallParam(
         id=tool_call.id,
         function=Function(
-            name=tool_call.name, arguments=json.dumps(tool_call.arguments)
+            name=tool_call.name, arguments=orjson.dumps(tool_call.arguments).decode()
         ),
         type="function",
     )
@@ -152,9 +152,15 @@ def init_openai_llm():
         openai_model = "gpt-4o-mini"
 
 
+def close_openai_llm():
+    if openai_client:
+        openai_client.close()
+
+
 OpenAILLM = LLM(
     name="OpenAI",
     model_name=openai_model,
     get_model_response=get_openai_model_response,
     on_startup=init_openai_llm,
+    on_shutdown=close_openai_llm,
 )
@@ -1,11 +1,16 @@
 #!/usr/bin/env python3
 
 import argparse
+import atexit
+import logging
+import logging.handlers
 import os
+import queue
 import signal
+import sys
 import threading
 import time
-from typing import Optional
+from typing import Optional, TextIO
 
 from dotenv import load_dotenv
 from rich.console import Console
@@ -17,6 +22,7 @@ from llms.anthropic import AnthropicLLM
 from memory.simple_vector_store import SVSVectorStore
 from memory.vector_store import VectorStore
 from tools.index import Toolbox
+from tools.libraries.core.scraper import force_quit_driver
 from utils.pubsub import PubSub
 
 load_dotenv()
@@ -64,7 +70,29 @@ VECTOR_STORE: Optional[VectorStore] = VECTOR_STORE_CHOICE_MAP.get(
 PUBSUB = PubSub()
 TOOLBOX = Toolbox(pubsub=PUBSUB)
 
-log_lock = threading.Lock()  # For thread-safe log file operations
+# Log lines are handed to a single background writer so publishers never block on disk
+log_queue: "queue.Queue[Optional[tuple[str, str]]]" = queue.Queue()
+LOG_BATCH_SIZE = 256
+LOG_FLUSH_INTERVAL = 0.1  # seconds
+# Append handles stay open for the life of the process; only the writer thread uses them
+log_handles: dict[str, TextIO] = {}
+
+
+# The chat thread is kept in a size-capped, rotating file so long sessions stay bounded
+thread_logger = logging.getLogger("simple_agent.thread")
+thread_logger.setLevel(logging.INFO)
+thread_logger.propagate = False
+thread_handler = logging.handlers.RotatingFileHandler(
+    os.path.join(log_directory, "last_thread.md"),
+    maxBytes=1 << 20,
+    backupCount=3,
+    encoding="utf-8",
+    delay=True,
+)
+thread_handler.setFormatter(
+    logging.Formatter("**%(asctime)s**: %(message)s", datefmt="%Y-%m-%d %H:%M:%S")
+)
+thread_logger.addHandler(thread_handler)
 
 
 def clear_logs():
@@ -77,6 +105,11 @@ def clear_logs():
 def clear_threads():
     with open(os.path.join(log_directory, "last_thread.md"), "w") as f:
         f.write("")
+    # Drop rotated backups too, so they don't carry over from earlier sessions
+    for i in range(1, thread_handler.backupCount + 1):
+        backup = f"{thread_handler.baseFilename}.{i}"
+        if os.path.exists(backup):
+            os.remove(backup)
 
 
 def handle_errors():
@@ -86,11 +119,83 @@ def handle_errors():
     )
 
 
+def write_batch(batch: list[tuple[str, str]]):
+    lines_by_path: dict[str, list[str]] = {}
+    for file_path, line in batch:
+        lines_by_path.setdefault(file_path, []).append(line)
+    for file_path, lines in lines_by_path.items():
+        f = log_handles.get(file_path)
+        if f is None:
+            f = log_handles[file_path] = open(
+                file_path, "a", buffering=1 << 16, encoding="utf-8"
+            )
+        f.write("".join(lines))
+        f.flush()
+
+
+def log_writer():
+    running = True
+    while running:
+        item = log_queue.get()
+        if item is None:
+            break
+        batch = [item]
+        deadline = time.monotonic() + LOG_FLUSH_INTERVAL
+        while len(batch) < LOG_BATCH_SIZE:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                item = log_queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if item is None:
+                running = False
+                break
+            batch.append(item)
+        try:
+            write_batch(batch)
+        except Exception as e:
+            # Keep the writer alive, otherwise the queue would grow with nobody reading it
+            sys.stderr.write(f"Error writing {len(batch)} log line(s): {e}\n")
+
+
+log_writer_thread = threading.Thread(target=log_writer, daemon=True)
+log_writer_thread.start()
+
+
+def drain_logs():
+    log_queue.put(None)
+    log_writer_thread.join(timeout=5)
+    for f in log_handles.values():
+        f.close()
+
+
+atexit.register(drain_logs)
+
+
+# (second, formatted timestamp) so strftime only runs once per second of logging.
+# Kept as one tuple so threads never see a second paired with another second's string.
+log_timestamp: tuple[int, str] = (0, "")
+
+
+def get_log_timestring() -> str:
+    global log_timestamp
+    now = int(time.time())
+    second, timestring = log_timestamp
+    if now != second:
+        timestring = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(now))
+        log_timestamp = (now, timestring)
+    return timestring
+
+
+def write_to_thread(log: str):
+    thread_logger.info("%s", log)
+
+
 def write_to_file(file_path, log: str):
-    with log_lock:  # Ensure only one thread writes to a file at a time
-        with open(file_path, "a") as f:
-            current_timestring = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime())
-            f.write(f"**{current_timestring}**: {log}\n")
+    current_timestring = get_log_timestring()
+    log_queue.put((file_path, f"**{current_timestring}**: {log}\n"))
 
 
 def handle_logs():
@@ -116,32 +221,44 @@ def prompt_user():
     if user_input.lower() == "exit":
         console.print("[blue bold]Simmy:[/blue bold] Goodbye!")
         PUBSUB.publish("exit_signal", "User exit")
-    write_to_file(os.path.join(log_directory, "last_thread.md"), f"User: {user_input}")
+    write_to_thread(f"User: {user_input}")
     PUBSUB.publish("new_user_message", user_input)
 
 
 def on_new_agent_message(message: str):
     console.print("[blue bold]Simmy:[/blue bold]")
     console.print(Markdown(message))
-    write_to_file(os.path.join(log_directory, "last_thread.md"), f"Agent: {message}")
+    write_to_thread(f"Agent: {message}")
 
 
 def on_new_agent_message_with_prompt(message: str):
     console.print("[blue bold]Simmy:[/blue bold]")
     console.print(Markdown(message))
-    write_to_file(os.path.join(log_directory, "last_thread.md"), f"Agent: {message}")
+    write_to_thread(f"Agent: {message}")
     prompt_user()
 
 
 def on_new_agent_perception(perception: str):
-    write_to_file(
-        os.path.join(log_directory, "last_thread.md"), f"Perception:\n{perception}\n"
-    )
+    write_to_thread(f"Perception:\n{perception}\n")
+
+
+stop_event = threading.Event()
 
 
 def handle_exit(m: str):
     console.print("Shutting down agent...")
     agent.stop()
+    LLM.shutdown()
+    if threading.current_thread() is not agent.thread:
+        # A request blocked on the network may not notice the closed client, so the
+        # join timeout plus os._exit is what bounds how long exiting takes
+        agent.thread.join(timeout=1.0)
+        if agent.thread.is_alive():
+            console.print("Agent did not stop in time. Exiting now.")
+            # os._exit skips atexit handlers, so run the ones that matter here
+            drain_logs()
+            force_quit_driver()
+            os._exit(0)
     console.print("Agent stopped. Exiting now.")
     exit(0)
 
@@ -188,12 +305,9 @@ if __name__ == "__main__":
 
     console.print("[blue bold]Simmy:[/blue bold] Hello and welcome! My name is Simmy!")
 
-    # Start handling errors and logs in separate threads
-    error_thread = threading.Thread(target=handle_errors)
-    error_thread.start()
-
-    log_thread = threading.Thread(target=handle_logs)
-    log_thread.start()
+    # Subscribe the error and log handlers
+    handle_errors()
+    handle_logs()
 
     # Create and start the agent
     agent = Agent(
@@ -203,6 +317,7 @@ if __name__ == "__main__":
         vector_store=VECTOR_STORE,
         verbose=verbose,
         silence_actions=silence_actions,
+        stop_event=stop_event,
     )
     agent.start()
 
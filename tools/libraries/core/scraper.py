@@ -3,12 +3,86 @@ from selenium import webdriver
 from selenium.webdriver.chrome.service import Service as ChromeService
 from webdriver_manager.chrome import ChromeDriverManager
 from utils.pubsub import PubSub
-from typing import Any
+from typing import Any, Optional
 from bs4 import BeautifulSoup
+from urllib.parse import urlsplit
+import atexit
 import requests
+import threading
+
+# A single Chrome instance is shared by every run_javascript call, since starting
+# the browser (and resolving the driver path) takes several seconds.
+_driver_lock = threading.Lock()
+_driver: Optional[webdriver.Chrome] = None
+_driver_path: Optional[str] = None
+# Seconds before a page load or script gives up, so one hung call can't hold the lock
+PAGE_LOAD_TIMEOUT = 30
+SCRIPT_TIMEOUT = 30
+
+
+def _get_driver() -> webdriver.Chrome:
+    global _driver, _driver_path
+    if _driver is None:
+        if _driver_path is None:
+            _driver_path = ChromeDriverManager().install()
+        options = webdriver.ChromeOptions()
+        options.add_argument("--headless=new")
+        options.add_argument("--disable-gpu")
+        options.add_argument("--no-sandbox")
+        options.add_argument("--disable-dev-shm-usage")
+        # Scripts only need the DOM, so don't wait for subresources or fetch images
+        options.page_load_strategy = "eager"
+        options.add_experimental_option(
+            "prefs", {"profile.managed_default_content_settings.images": 2}
+        )
+        _driver = webdriver.Chrome(
+            service=ChromeService(_driver_path), options=options
+        )
+        # Chrome has no content setting for stylesheets, so block them over CDP
+        _driver.execute_cdp_cmd("Network.enable", {})
+        _driver.execute_cdp_cmd(
+            "Network.setBlockedURLs", {"urls": ["*.css", "*.css?*"]}
+        )
+        _driver.set_page_load_timeout(PAGE_LOAD_TIMEOUT)
+        _driver.set_script_timeout(SCRIPT_TIMEOUT)
+    return _driver
+
+
+def _reset_driver(driver: webdriver.Chrome, url: str):
+    # Each call should see a fresh browser, so wipe cookies, storage and cache
+    # that the last page left behind, then drop the page itself
+    driver.execute_cdp_cmd("Network.clearBrowserCookies", {})
+    driver.execute_cdp_cmd("Network.clearBrowserCache", {})
+    parts = urlsplit(url)
+    if parts.scheme and parts.netloc:
+        driver.execute_cdp_cmd(
+            "Storage.clearDataForOrigin",
+            {"origin": f"{parts.scheme}://{parts.netloc}", "storageTypes": "all"},
+        )
+    driver.get("about:blank")
+
+
+def force_quit_driver():
+    # Doesn't wait on _driver_lock, for hard exits where a call may still hold it
+    global _driver
+    driver, _driver = _driver, None
+    if driver is not None:
+        try:
+            driver.quit()
+        except Exception:
+            pass
+
+
+def _quit_driver():
+    with _driver_lock:
+        force_quit_driver()
+
+
+atexit.register(_quit_driver)
 
 
 def run(args: Any, ps: PubSub):
+    global _driver
     if not args or "url" not in args:
         return "Error running web_request: No URL provided."
     if "script" not in args:
@@ -17,18 +91,30 @@ def run(args: Any, ps: PubSub):
     url = args["url"]
     script = args["script"]
 
-    driver = webdriver.Chrome(service=ChromeService(ChromeDriverManager().install()))
-
-    try:
-        driver.get(url)
-        # Execute the JavaScript code
-        result = driver.execute_script(script)
-
-        return f"JavaScript result:\n```\n{result}\n```"
-    except Exception as err:
-        return f"Error occurred: {err}"
-    finally:
-        driver.quit()
+    with _driver_lock:
+        try:
+            driver = _get_driver()
+        except Exception as err:
+            return f"Error starting browser: {err}"
+
+        try:
+            driver.get(url)
+            # Execute the JavaScript code
+            result = driver.execute_script(script)
+
+            return f"JavaScript result:\n```\n{result}\n```"
+        except Exception as err:
+            return f"Error occurred: {err}"
+        finally:
+            try:
+                _reset_driver(driver, url)
+            except Exception:
+                # The browser is unusable, start a fresh one next time
+                _driver = None
+                try:
+                    driver.quit()
+                except Exception:
+                    pass
 
 
 run_javascript = Tool(
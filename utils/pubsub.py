@@ -1,11 +1,13 @@
 import threading
-from typing import Any, Callable, Dict, List
+from typing import Any, Callable, Dict, List, Tuple
 
 
 class PubSub:
     def __init__(self) -> None:
         # Dictionary to hold event names and their corresponding subscribers
         self.subscribers: Dict[str, List[Callable[[Any], None]]] = {}
+        # Immutable snapshot of each event's subscribers, rebuilt lazily after changes
+        self._frozen: Dict[str, Tuple[Callable[[Any], Any], ...]] = {}
         # Lock to ensure thread-safe operations
         self.lock = threading.Lock()
 
@@ -15,6 +17,7 @@ class PubSub:
             if event_type not in self.subscribers:
                 self.subscribers[event_type] = []
             self.subscribers[event_type].append(handler)
+            self._frozen.pop(event_type, None)
 
     def unsubscribe(self, event_type: str, handler: Callable[[Any], None]) -> None:
         """Removes a subscriber (handler) from an event type."""
@@ -23,15 +26,20 @@ class PubSub:
                 self.subscribers[event_type].remove(handler)
                 if not self.subscribers[event_type]:
                     del self.subscribers[event_type]
+                self._frozen.pop(event_type, None)
 
     def publish(self, event_type: str, data: Any) -> None:
         """Publishes an event to all subscribers of that event type."""
-        subscribers_copy = []
-        with self.lock:
-            if event_type in self.subscribers:
-                # Copy the subscriber list to avoid issues if subscribers are modified during iteration
-                subscribers_copy = self.subscribers[event_type][:]
+        handlers = self._frozen.get(event_type)
+        if handlers is None:
+            with self.lock:
+                # Snapshot the subscriber list so it can be iterated while subscribers change
+                handlers = tuple(self.subscribers.get(event_type, ()))
+                self._frozen[event_type] = handlers
 
         # Invoke handlers outside the locked region to avoid potential deadlocks and to allow concurrent handling
-        for handler in subscribers_copy:
+        if len(handlers) == 1:
+            handlers[0](data)
+            return
+        for handler in handlers:
             handler(data)